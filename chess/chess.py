@@ -4,128 +4,259 @@
 from __future__ import annotations
 import logging
 import abc
-import re
-from enum import Enum
-from typing import Tuple
+import random
+from typing import Callable, Iterator, NamedTuple
 from typing_extensions import Final
 
 LOG: logging.Logger = logging.getLogger(__file__)
 
 
-class Color(Enum):
-    BLACK = 0
-    WHITE = 1
+# Colors are plain ints so that comparisons stay cheap and the opposite color
+# is `color ^ 1`.
+BLACK: Final[int] = 0
+WHITE: Final[int] = 1
+
+_COLOR_STR: Final[tuple[str, str]] = ("black", "white")
+
+# Piece types, also the lower three bits of a piece byte in `Board._board`.
+EMPTY_TYPE: Final[int] = 0
+PAWN: Final[int] = 1
+KNIGHT: Final[int] = 2
+BISHOP: Final[int] = 3
+ROOK: Final[int] = 4
+QUEEN: Final[int] = 5
+KING: Final[int] = 6
+
+
+def popcount(bitboard: int) -> int:
+    return bitboard.bit_count()
+
+
+def lsb(bitboard: int) -> int:
+    """Index of the least significant set bit, or -1 for an empty bitboard."""
+    return (bitboard & -bitboard).bit_length() - 1
+
+
+# Pawn targets per square, indexed by `row * 8 + column`. The double push is
+# only available if the single push target is empty as well.
+PAWN_PUSH_W: Final[list[int]] = [0] * 64
+PAWN_PUSH_B: Final[list[int]] = [0] * 64
+PAWN_PUSH2_W: Final[list[int]] = [0] * 64
+PAWN_PUSH2_B: Final[list[int]] = [0] * 64
+PAWN_ATTACK_W: Final[list[int]] = [0] * 64
+PAWN_ATTACK_B: Final[list[int]] = [0] * 64
+
+for _row in range(8):
+    for _column in range(8):
+        _square = _row * 8 + _column
+        if _row < 7:
+            PAWN_PUSH_W[_square] = 1 << (_square + 8)
+            if _column > 0:
+                PAWN_ATTACK_W[_square] |= 1 << (_square + 7)
+            if _column < 7:
+                PAWN_ATTACK_W[_square] |= 1 << (_square + 9)
+        if _row > 0:
+            PAWN_PUSH_B[_square] = 1 << (_square - 8)
+            if _column > 0:
+                PAWN_ATTACK_B[_square] |= 1 << (_square - 9)
+            if _column < 7:
+                PAWN_ATTACK_B[_square] |= 1 << (_square - 7)
+        if _row == 1:
+            PAWN_PUSH2_W[_square] = 1 << (_square + 16)
+        if _row == 6:
+            PAWN_PUSH2_B[_square] = 1 << (_square - 16)
+
+# Knight and king targets per square, regardless of occupation.
+KNIGHT_ATTACKS: Final[list[int]] = [0] * 64
+KING_ATTACKS: Final[list[int]] = [0] * 64
+
+for _row in range(8):
+    for _column in range(8):
+        _square = _row * 8 + _column
+        for _row_offset, _column_offset in (
+            (1, 2),
+            (2, 1),
+            (2, -1),
+            (1, -2),
+            (-1, -2),
+            (-2, -1),
+            (-2, 1),
+            (-1, 2),
+        ):
+            if 0 <= _row + _row_offset < 8 and 0 <= _column + _column_offset < 8:
+                KNIGHT_ATTACKS[_square] |= 1 << (
+                    _square + _row_offset * 8 + _column_offset
+                )
+        for _row_offset in (-1, 0, 1):
+            for _column_offset in (-1, 0, 1):
+                if (_row_offset or _column_offset) and (
+                    0 <= _row + _row_offset < 8 and 0 <= _column + _column_offset < 8
+                ):
+                    KING_ATTACKS[_square] |= 1 << (
+                        _square + _row_offset * 8 + _column_offset
+                    )
 
-    def __str__(self) -> str:
-        if self == Color.BLACK:
-            return "black"
-        else:
-            return "white"
+ROOK_DIRECTIONS: Final[tuple[tuple[int, int], ...]] = (
+    (1, 0),
+    (-1, 0),
+    (0, 1),
+    (0, -1),
+)
+BISHOP_DIRECTIONS: Final[tuple[tuple[int, int], ...]] = (
+    (1, 1),
+    (1, -1),
+    (-1, 1),
+    (-1, -1),
+)
+
+
+def _slide(square: int, occupancy: int, directions: tuple[tuple[int, int], ...]) -> int:
+    """Fields reached along `directions`, each ray stops at the first piece."""
+    attacks = 0
+    for row_offset, column_offset in directions:
+        row = (square >> 3) + row_offset
+        column = (square & 7) + column_offset
+        while 0 <= row < 8 and 0 <= column < 8:
+            mask = 1 << (row * 8 + column)
+            attacks |= mask
+            if occupancy & mask:
+                break
+            row += row_offset
+            column += column_offset
+    return attacks
+
+
+def _slider_tables(
+    directions: tuple[tuple[int, int], ...],
+) -> tuple[list[int], list[dict[int, int]]]:
+    """Relevant blocker mask and attacks per masked occupancy for each square.
+
+    The last field of a ray is left out of the mask since a piece there does
+    not block anything. The tables hold every subset of the mask, so looking up
+    `occupancy & mask` replaces the multiply and shift of magic bitboards.
+    """
+    masks = []
+    tables = []
+    for square in range(64):
+        mask = 0
+        for row_offset, column_offset in directions:
+            row = (square >> 3) + row_offset
+            column = (square & 7) + column_offset
+            while 0 <= row + row_offset < 8 and 0 <= column + column_offset < 8:
+                mask |= 1 << (row * 8 + column)
+                row += row_offset
+                column += column_offset
+
+        table = {}
+        blockers = 0
+        while True:
+            table[blockers] = _slide(square, blockers, directions)
+            blockers = (blockers - mask) & mask
+            if not blockers:
+                break
+
+        masks.append(mask)
+        tables.append(table)
+    return masks, tables
+
+
+ROOK_MASK, ROOK_TABLE = _slider_tables(ROOK_DIRECTIONS)
+BISHOP_MASK, BISHOP_TABLE = _slider_tables(BISHOP_DIRECTIONS)
+
+
+def rook_attacks(square: int, occupancy: int) -> int:
+    return ROOK_TABLE[square][occupancy & ROOK_MASK[square]]
 
-    def inverse(self) -> Color:
-        if self == Color.BLACK:
-            return Color.WHITE
-        else:
-            return Color.BLACK
+
+def bishop_attacks(square: int, occupancy: int) -> int:
+    return BISHOP_TABLE[square][occupancy & BISHOP_MASK[square]]
 
 
 class Field:
-    def __init__(self, color: Color | None) -> None:
-        self.color: Final[Color | None] = color
+    __slots__ = ("color", "_rendered")
 
-    def __str__(self) -> str:
-        if self.color is None:
-            return " "
+    PIECE_TYPE: int = EMPTY_TYPE
+
+    def __init__(self, color: int | None) -> None:
+        self.color: Final[int | None] = color
 
-        color = "\033[30m" if self.color == Color.BLACK else "\033[37m"
-        return f"{color}{self.name()}\033[0m"
+        rendered = " "
+        if color is not None:
+            prefix = "\033[30m" if color == BLACK else "\033[37m"
+            rendered = f"{prefix}{self.name()}\033[0m"
+        self._rendered: Final[str] = rendered
+
+    def __str__(self) -> str:
+        return self._rendered
 
     def is_empty(self) -> bool:
-        return self.color == None
+        return self.color is None
 
     @abc.abstractmethod
     def name(self) -> str:
         pass
 
-    @abc.abstractmethod
-    def can_move_to(self, board: Board, from_: Position) -> list[Position]:
-        return []
-
 
 class Empty(Field):
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(color=None)
 
-    def can_move_to(self, board: Board, from_: Position) -> list[Position]:
-        return []
-
-
-class Pawn(Field):
     def name(self) -> str:
-        return "P"
-
-    def can_move_to(self, board: Board, from_: Position) -> list[Position]:
-        candidates = []
-
-        direction = 1 if self.color == Color.WHITE else -1
+        return " "
 
-        # Forward
-        advance_one = from_.translate(row_offset=direction)
-        if advance_one is not None and board[advance_one].is_empty():
-            candidates.append(advance_one)
 
-            if (self.color == Color.WHITE and from_.row == 1) or (
-                self.color == Color.BLACK and from_.row == 6
-            ):
-                advance_two = advance_one.translate(row_offset=direction)
-                if advance_two is not None and board[advance_two].is_empty():
-                    candidates.append(advance_two)
+class Pawn(Field):
+    __slots__ = ()
 
-        # Strike
-        advance_left = from_.translate(row_offset=direction, column_offset=-1)
-        if (
-            advance_left is not None
-            and board[advance_left].color == self.color.inverse()
-        ):
-            candidates.append(advance_left)
+    PIECE_TYPE: int = PAWN
 
-        advance_right = from_.translate(row_offset=direction, column_offset=1)
-        if (
-            advance_right is not None
-            and board[advance_right].color == self.color.inverse()
-        ):
-            candidates.append(advance_right)
-
-        # En passant
-        # TODO: not implemented
+    def name(self) -> str:
+        return "P"
 
-        # Queen conversion
-        # TODO: not implemented
 
-        return candidates
+class Rook(Field):
+    __slots__ = ()
 
+    PIECE_TYPE: int = ROOK
 
-class Rook(Field):
     def name(self) -> str:
         return "R"
 
 
 class King(Field):
+    __slots__ = ()
+
+    PIECE_TYPE: int = KING
+
     def name(self) -> str:
         return "K"
 
 
 class Queen(Field):
+    __slots__ = ()
+
+    PIECE_TYPE: int = QUEEN
+
     def name(self) -> str:
         return "Q"
 
 
 class Knight(Field):
+    __slots__ = ()
+
+    PIECE_TYPE: int = KNIGHT
+
     def name(self) -> str:
         return "N"
 
 
 class Bishop(Field):
+    __slots__ = ()
+
+    PIECE_TYPE: int = BISHOP
+
     def name(self) -> str:
         return "B"
 
@@ -135,21 +266,26 @@ class InvalidPosition(Exception):
 
 
 class Position:
+    __slots__ = ("row", "column", "square")
+
     def __init__(self, row: int, column: int) -> None:
         # Rows: 1, 2, 3, ...
         # Columns: A, B, C, ...
         self.row: Final[int] = row
         self.column: Final[int] = column
+        # Bit index in the board's bitboards
+        self.square: Final[int] = row * 8 + column
 
     @classmethod
     def parse(cls, input: str) -> Position:
-        match = re.match(r"^([a-h])([1-8])$", input)
-        if match is None:
+        if len(input) != 2 or not ("a" <= input[0] <= "h" and "1" <= input[1] <= "8"):
             raise InvalidPosition(f"`{input}` is not a valid field, e.g. A1")
 
-        return Position(
-            ord(match.groups(0)[1]) - ord("1"), ord(match.groups(0)[0]) - ord("a")
-        )
+        return _POSITIONS[(ord(input[1]) - ord("1")) * 8 + ord(input[0]) - ord("a")]
+
+    @staticmethod
+    def of(row: int, column: int) -> Position:
+        return _POSITIONS[row * 8 + column]
 
     def __str__(self) -> str:
         return f"{chr(self.column + ord('A'))}{chr(self.row + ord('1'))}"
@@ -161,109 +297,504 @@ class Position:
         return self.row == other.row and self.column == other.column
 
     def translate(
-        self, *, row_offset: int | None = 0, column_offset: int | None = 0
+        self, *, row_offset: int = 0, column_offset: int = 0
     ) -> Position | None:
         row = self.row + row_offset
         column = self.column + column_offset
 
-        if row in range(8) and column in range(8):
-            return Position(row, column)
+        if 0 <= row < 8 and 0 <= column < 8:
+            return _POSITIONS[row * 8 + column]
 
         return None
 
 
-class InvalidMove(Exception):
-    pass
+# Positions are immutable, so only the 64 fields of the board are ever created.
+_POSITIONS: Final[tuple[Position, ...]] = tuple(
+    Position(row, column) for row in range(8) for column in range(8)
+)
 
 
-class Board:
-    def __init__(self) -> None:
-        # self._board[1][a] is bottom left, self._board[1][h] is bottom right
-        self._board: list[list[Field]] = []
-        for row_index in range(8):
-            self._board.append([Empty()] * 8)
+def pawn_moves(board: Board, square: int, color: int) -> int:
+    empty = ~board.occ_all
 
-        self._board[0][4] = King(Color.WHITE)
-        self._board[7][4] = King(Color.BLACK)
+    # Forward
+    if color == WHITE:
+        pushes = PAWN_PUSH_W[square] & empty
+        if pushes:
+            pushes |= PAWN_PUSH2_W[square] & empty
+        strikes = PAWN_ATTACK_W[square] & board.occ_b
+    else:
+        pushes = PAWN_PUSH_B[square] & empty
+        if pushes:
+            pushes |= PAWN_PUSH2_B[square] & empty
+        strikes = PAWN_ATTACK_B[square] & board.occ_w
 
-        self._board[0][3] = Queen(Color.WHITE)
-        self._board[7][3] = Queen(Color.BLACK)
+    # En passant
+    # TODO: not implemented
 
-        self._board[0][2] = Bishop(Color.WHITE)
-        self._board[7][2] = Bishop(Color.BLACK)
-        self._board[0][5] = Bishop(Color.WHITE)
-        self._board[7][5] = Bishop(Color.BLACK)
+    # Queen conversion
+    # TODO: not implemented
 
-        self._board[0][1] = Knight(Color.WHITE)
-        self._board[7][1] = Knight(Color.BLACK)
-        self._board[0][6] = Knight(Color.WHITE)
-        self._board[7][6] = Knight(Color.BLACK)
+    return pushes | strikes
 
-        self._board[0][0] = Rook(Color.WHITE)
-        self._board[7][0] = Rook(Color.BLACK)
-        self._board[0][7] = Rook(Color.WHITE)
-        self._board[7][7] = Rook(Color.BLACK)
 
-        self._board[1] = [Pawn(Color.WHITE)] * 8
-        self._board[6] = [Pawn(Color.BLACK)] * 8
+def knight_moves(board: Board, square: int, color: int) -> int:
+    own = board.occ_w if color == WHITE else board.occ_b
+    return KNIGHT_ATTACKS[square] & ~own
+
+
+def king_moves(board: Board, square: int, color: int) -> int:
+    # Castling
+    # TODO: not implemented
+
+    own = board.occ_w if color == WHITE else board.occ_b
+    return KING_ATTACKS[square] & ~own
+
+
+def bishop_moves(board: Board, square: int, color: int) -> int:
+    own = board.occ_w if color == WHITE else board.occ_b
+    return bishop_attacks(square, board.occ_w | board.occ_b) & ~own
+
+
+def rook_moves(board: Board, square: int, color: int) -> int:
+    own = board.occ_w if color == WHITE else board.occ_b
+    return rook_attacks(square, board.occ_w | board.occ_b) & ~own
 
-    def __str__(self) -> str:
-        light = "\u001b[42m"
-        dark = "\u001b[43m"
-        clear = "\033[0m"
 
-        lines = ["  ABCDEFGH"]
+def queen_moves(board: Board, square: int, color: int) -> int:
+    occupancy = board.occ_w | board.occ_b
+    own = board.occ_w if color == WHITE else board.occ_b
+    return (rook_attacks(square, occupancy) | bishop_attacks(square, occupancy)) & ~own
 
-        for row_index, row in enumerate(self._board):
-            line = f"{row_index + 1} "
-            for field_index, field in enumerate(row):
-                color = dark if (row_index + field_index) % 2 == 0 else light
-                line += f"{color}{field or ' '}{clear}"
-            lines.append(line)
 
-        return "\n".join(reversed(lines))
+def no_moves(board: Board, square: int, color: int) -> int:
+    return 0
+
+
+# Move generator for each piece type, called with the board, the square of the
+# piece and its color. Returns the bitboard of target squares.
+MOVEGEN: Final[tuple[Callable[[Board, int, int], int], ...]] = (
+    no_moves,
+    pawn_moves,
+    knight_moves,
+    bishop_moves,
+    rook_moves,
+    queen_moves,
+    king_moves,
+)
+
+
+class InvalidMove(Exception):
+    pass
+
+
+# Pieces are encoded as one byte in `Board._board`: the lower three bits hold
+# the piece type, bit 3 is set for black pieces and 0 is an empty field.
+BLACK_BIT: Final[int] = 8
+
+# Fields only hold their color, so every board shares these instances.
+EMPTY: Final[Field] = Empty()
+WHITE_PAWN: Final[Field] = Pawn(WHITE)
+WHITE_KNIGHT: Final[Field] = Knight(WHITE)
+WHITE_BISHOP: Final[Field] = Bishop(WHITE)
+WHITE_ROOK: Final[Field] = Rook(WHITE)
+WHITE_QUEEN: Final[Field] = Queen(WHITE)
+WHITE_KING: Final[Field] = King(WHITE)
+BLACK_PAWN: Final[Field] = Pawn(BLACK)
+BLACK_KNIGHT: Final[Field] = Knight(BLACK)
+BLACK_BISHOP: Final[Field] = Bishop(BLACK)
+BLACK_ROOK: Final[Field] = Rook(BLACK)
+BLACK_QUEEN: Final[Field] = Queen(BLACK)
+BLACK_KING: Final[Field] = King(BLACK)
+
+# Field and `Board` bitboard attribute for each piece byte.
+_PIECE_TABLE: Final[tuple[Field, ...]] = (
+    EMPTY,
+    WHITE_PAWN,
+    WHITE_KNIGHT,
+    WHITE_BISHOP,
+    WHITE_ROOK,
+    WHITE_QUEEN,
+    WHITE_KING,
+    EMPTY,
+    EMPTY,
+    BLACK_PAWN,
+    BLACK_KNIGHT,
+    BLACK_BISHOP,
+    BLACK_ROOK,
+    BLACK_QUEEN,
+    BLACK_KING,
+    EMPTY,
+)
+_BITBOARD_NAMES: Final[tuple[str, ...]] = (
+    "",
+    "pawns_w",
+    "knights_w",
+    "bishops_w",
+    "rooks_w",
+    "queens_w",
+    "kings_w",
+    "",
+    "",
+    "pawns_b",
+    "knights_b",
+    "bishops_b",
+    "rooks_b",
+    "queens_b",
+    "kings_b",
+    "",
+)
+# Rendered field for each piece byte, including the reset of the background.
+PIECE_STR: Final[tuple[str, ...]] = tuple(f"{field}\033[0m" for field in _PIECE_TABLE)
+# Background of dark and light fields, indexed by `(row + column) & 1`.
+CHECKER_BG: Final[tuple[str, str]] = ("\u001b[43m", "\u001b[42m")
+# Rendered field for each piece byte and field parity.
+RENDER: Final[tuple[tuple[str, str], ...]] = tuple(
+    (CHECKER_BG[0] + rendered, CHECKER_BG[1] + rendered) for rendered in PIECE_STR
+)
+
+_INITIAL_BOARD: Final[bytes] = bytes(
+    [4, 2, 3, 5, 6, 3, 2, 4]
+    + [1] * 8
+    + [0] * 32
+    + [9] * 8
+    + [12, 10, 11, 13, 14, 11, 10, 12]
+)
+
+# Zobrist keys per piece byte and square. A board's hash is the XOR of the keys
+# of all its pieces, so moves update it incrementally.
+_zobrist_random = random.Random(0x5EED)
+ZOBRIST: Final[tuple[tuple[int, ...], ...]] = tuple(
+    tuple(_zobrist_random.getrandbits(64) if piece & 7 else 0 for _ in range(64))
+    for piece in range(16)
+)
+# Zobrist key for the side to move, indexed by color.
+ZOBRIST_TURN: Final[tuple[int, int]] = (_zobrist_random.getrandbits(64), 0)
+
+
+def _zobrist_hash(board: bytes) -> int:
+    result = 0
+    for square in range(64):
+        result ^= ZOBRIST[board[square]][square]
+    return result
+
+
+_INITIAL_HASH: Final[int] = _zobrist_hash(_INITIAL_BOARD)
+
+# Material values in centipawns.
+PAWN_VALUE: Final[int] = 100
+KNIGHT_VALUE: Final[int] = 320
+BISHOP_VALUE: Final[int] = 330
+ROOK_VALUE: Final[int] = 500
+QUEEN_VALUE: Final[int] = 900
+MATE: Final[int] = 100000
+
+
+class UndoInfo(NamedTuple):
+    from_square: int
+    to_square: int
+    # Piece bytes, `captured` is 0 if the move did not strike
+    captured: int
+    moving: int
+
+
+class Board:
+    __slots__ = (
+        "_board",
+        "pawns_w",
+        "knights_w",
+        "bishops_w",
+        "rooks_w",
+        "queens_w",
+        "kings_w",
+        "pawns_b",
+        "knights_b",
+        "bishops_b",
+        "rooks_b",
+        "queens_b",
+        "kings_b",
+        "occ_w",
+        "occ_b",
+        "_hash",
+        "_rows",
+        "_dirty",
+    )
+
+    def __init__(self) -> None:
+        # self._board[0] is bottom left (A1), self._board[7] is bottom right (H1)
+        self._board: bytearray = bytearray(_INITIAL_BOARD)
+
+        # Bit `row * 8 + column` is set if the piece occupies that field, i.e.
+        # bit 0 is A1 (bottom left) and bit 63 is H8 (top right).
+        self.pawns_w: int = 0x000000000000FF00
+        self.knights_w: int = 0x0000000000000042
+        self.bishops_w: int = 0x0000000000000024
+        self.rooks_w: int = 0x0000000000000081
+        self.queens_w: int = 0x0000000000000008
+        self.kings_w: int = 0x0000000000000010
+
+        self.pawns_b: int = 0x00FF000000000000
+        self.knights_b: int = 0x4200000000000000
+        self.bishops_b: int = 0x2400000000000000
+        self.rooks_b: int = 0x8100000000000000
+        self.queens_b: int = 0x0800000000000000
+        self.kings_b: int = 0x1000000000000000
+
+        self.occ_w: int = 0x000000000000FFFF
+        self.occ_b: int = 0xFFFF000000000000
+
+        self._hash: int = _INITIAL_HASH
+
+        # Rendered rows for `__str__`, bit `row` of `_dirty` is set if the row
+        # changed since it was last rendered.
+        self._rows: list[str] = [""] * 8
+        self._dirty: int = 0xFF
+
+    @property
+    def occ_all(self) -> int:
+        return self.occ_w | self.occ_b
+
+    def __str__(self) -> str:
+        board = self._board
+        rows = self._rows
+        dirty = self._dirty
+        while dirty:
+            row_index = lsb(dirty)
+            rows[row_index] = f"{row_index + 1} " + "".join(
+                [
+                    RENDER[board[square]][(row_index + square) & 1]
+                    for square in range(row_index * 8, row_index * 8 + 8)
+                ]
+            )
+            dirty &= dirty - 1
+        self._dirty = 0
+
+        return "\n".join(reversed(rows)) + "\n  ABCDEFGH"
 
     def __getitem__(self, key: Position) -> Field:
-        return self._board[key.row][key.column]
+        return _PIECE_TABLE[self._board[key.square]]
 
     def __setitem__(self, key: Position, value: Field) -> None:
-        self._board[key.row][key.column] = value
+        square = key.square
+        mask = 1 << square
+
+        previous = self._board[square]
+        if previous:
+            self._clear(previous, mask)
+            self._hash ^= ZOBRIST[previous][square]
+
+        self._dirty |= 1 << (square >> 3)
+
+        piece = value.PIECE_TYPE
+        if value.color == BLACK:
+            piece |= BLACK_BIT
+        self._board[square] = piece
+        if piece:
+            self._hash ^= ZOBRIST[piece][square]
+            name = _BITBOARD_NAMES[piece]
+            setattr(self, name, getattr(self, name) | mask)
+            if piece & BLACK_BIT:
+                self.occ_b |= mask
+            else:
+                self.occ_w |= mask
+
+    def _clear(self, piece: int, mask: int) -> None:
+        name = _BITBOARD_NAMES[piece]
+        setattr(self, name, getattr(self, name) & ~mask)
+        if piece & BLACK_BIT:
+            self.occ_b &= ~mask
+        else:
+            self.occ_w &= ~mask
 
-    def move(self, *, moving_color: Color, from_: Position, to: Position) -> None:
-        field = self[from_]
+    def move(self, *, moving_color: int, from_: Position, to: Position) -> None:
+        from_square = from_.square
+        to_square = to.square
+        piece = self._board[from_square]
+        captured = self._board[to_square]
+        field = _PIECE_TABLE[piece]
+        target = _PIECE_TABLE[captured]
 
         if field.color != moving_color:
-            raise InvalidMove(f"no {color} piece at {from_}")
+            raise InvalidMove(f"no {_COLOR_STR[moving_color]} piece at {from_}")
 
-        if self[to].color == moving_color:
-            raise InvalidMove(f"cannot move to field with {moving_color} piece")
+        if target.color == moving_color:
+            raise InvalidMove(
+                f"cannot move to field with {_COLOR_STR[moving_color]} piece"
+            )
 
-        if to not in field.can_move_to(self, from_):
+        targets = MOVEGEN[piece & 7](self, from_square, moving_color)
+        if not (targets >> to_square) & 1:
             raise InvalidMove(f"{field} cannot move from {from_} to {to}")
 
-        if self[to].color not in [moving_color, None]:
-            LOG.info(f"{self[from_]} at {from_} strikes {self[to]} at {to}")
+        if captured:
+            LOG.info("%s at %s strikes %s at %s", field, from_, target, to)
+
+        self.push(from_square, to_square)
+
+    def push(self, from_square: int, to_square: int) -> UndoInfo:
+        """Move a piece without checking whether the move is valid."""
+        piece = self._board[from_square]
+        captured = self._board[to_square]
+        to_mask = 1 << to_square
+
+        if captured:
+            self._clear(captured, to_mask)
+            self._hash ^= ZOBRIST[captured][to_square]
+
+        move_mask = (1 << from_square) | to_mask
+        name = _BITBOARD_NAMES[piece]
+        setattr(self, name, getattr(self, name) ^ move_mask)
+        if piece & BLACK_BIT:
+            self.occ_b ^= move_mask
+        else:
+            self.occ_w ^= move_mask
+
+        self._board[to_square] = piece
+        self._board[from_square] = 0
+        self._dirty |= (1 << (from_square >> 3)) | (1 << (to_square >> 3))
+        self._hash ^= ZOBRIST[piece][from_square] ^ ZOBRIST[piece][to_square]
 
-        self[to] = field
-        self[from_] = Empty()
+        return UndoInfo(from_square, to_square, captured, piece)
+
+    def pop(self, undo: UndoInfo) -> None:
+        """Take back the move that returned `undo` from `push`."""
+        from_square, to_square, captured, piece = undo
+        to_mask = 1 << to_square
+
+        move_mask = (1 << from_square) | to_mask
+        name = _BITBOARD_NAMES[piece]
+        setattr(self, name, getattr(self, name) ^ move_mask)
+        if piece & BLACK_BIT:
+            self.occ_b ^= move_mask
+        else:
+            self.occ_w ^= move_mask
+        self._hash ^= ZOBRIST[piece][from_square] ^ ZOBRIST[piece][to_square]
+
+        if captured:
+            name = _BITBOARD_NAMES[captured]
+            setattr(self, name, getattr(self, name) | to_mask)
+            if captured & BLACK_BIT:
+                self.occ_b |= to_mask
+            else:
+                self.occ_w |= to_mask
+            self._hash ^= ZOBRIST[captured][to_square]
+
+        self._board[from_square] = piece
+        self._board[to_square] = captured
+        self._dirty |= (1 << (from_square >> 3)) | (1 << (to_square >> 3))
+
+    def moves(self, color: int) -> Iterator[tuple[int, int]]:
+        """Moves of `color` as (from, to) squares, ignoring checks."""
+        pieces = self.occ_w if color == WHITE else self.occ_b
+        while pieces:
+            from_square = lsb(pieces)
+            targets = MOVEGEN[self._board[from_square] & 7](self, from_square, color)
+            while targets:
+                yield from_square, lsb(targets)
+                targets &= targets - 1
+            pieces &= pieces - 1
+
+    def evaluate(self, color: int) -> int:
+        """Material balance in centipawns from the point of view of `color`."""
+        score = (
+            PAWN_VALUE * (popcount(self.pawns_w) - popcount(self.pawns_b))
+            + KNIGHT_VALUE * (popcount(self.knights_w) - popcount(self.knights_b))
+            + BISHOP_VALUE * (popcount(self.bishops_w) - popcount(self.bishops_b))
+            + ROOK_VALUE * (popcount(self.rooks_w) - popcount(self.rooks_b))
+            + QUEEN_VALUE * (popcount(self.queens_w) - popcount(self.queens_b))
+        )
+        return score if color == WHITE else -score
+
+
+# Bound stored with a transposition table score.
+_EXACT: Final[int] = 0
+_LOWER: Final[int] = 1
+_UPPER: Final[int] = 2
 
 
 class Game:
+    __slots__ = ("_board", "_turn", "_transpositions")
+
     def __init__(self) -> None:
         self._board: Board = Board()
-        self._turn = Color.WHITE
+        self._turn: int = WHITE
+        # Zobrist hash -> (depth, score, bound, best move)
+        self._transpositions: dict[
+            int, tuple[int, int, int, tuple[int, int] | None]
+        ] = {}
 
     def __str__(self) -> str:
-        color = "White" if self._turn == Color.WHITE else "Black"
-        return f"{self._board}\n{color}'s turn."
+        return f"{self._board}\n{_COLOR_STR[self._turn].capitalize()}'s turn."
 
     def move(self, *, from_: Position, to: Position) -> None:
         try:
             self._board.move(moving_color=self._turn, from_=from_, to=to)
-            self._turn = self._turn.inverse()
-            LOG.info(f"{self}")
+            self._turn ^= 1
+            LOG.info("%s", self)
         except InvalidMove as error:
-            LOG.error(f"Invalid move: {error}")
+            LOG.error("Invalid move: %s", error)
+
+    def search(self, depth: int) -> tuple[Position, Position] | None:
+        """Best move for the side to move, looking `depth` plies ahead."""
+        _, best = self._negamax(self._board, self._turn, depth, -MATE - 1, MATE + 1)
+        if best is None:
+            return None
+        return _POSITIONS[best[0]], _POSITIONS[best[1]]
+
+    def _negamax(
+        self, board: Board, color: int, depth: int, alpha: int, beta: int
+    ) -> tuple[int, tuple[int, int] | None]:
+        key = board._hash ^ ZOBRIST_TURN[color]
+        original_alpha = alpha
+        best_move = None
+
+        entry = self._transpositions.get(key)
+        if entry is not None:
+            entry_depth, score, bound, best_move = entry
+            if entry_depth >= depth:
+                if bound == _EXACT:
+                    return score, best_move
+                if bound == _LOWER:
+                    alpha = max(alpha, score)
+                else:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score, best_move
+
+        # Checks are not detected, losing the king ends the game.
+        if not (board.kings_w if color == WHITE else board.kings_b):
+            return -MATE, None
+        if depth == 0:
+            return board.evaluate(color), None
+
+        moves = list(board.moves(color))
+        if not moves:
+            return board.evaluate(color), None
+
+        # Try the best move of a previous search first, then captures.
+        moves.sort(key=lambda move: (move != best_move, board._board[move[1]] == 0))
+
+        best_score = -MATE - 1
+        for move in moves:
+            undo = board.push(move[0], move[1])
+            score = -self._negamax(board, color ^ 1, depth - 1, -beta, -alpha)[0]
+            board.pop(undo)
+            if score > best_score:
+                best_score = score
+                best_move = move
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                break
+
+        if best_score <= original_alpha:
+            bound = _UPPER
+        elif best_score >= beta:
+            bound = _LOWER
+        else:
+            bound = _EXACT
+        self._transpositions[key] = (depth, best_score, bound, best_move)
+
+        return best_score, best_move
 
 
 HELP = """\
@@ -306,7 +837,7 @@ def main() -> None:
 
             if command == "new":
                 game = Game()
-                LOG.info(f"{game}")
+                LOG.info("%s", game)
                 continue
 
             if command == "debug":
@@ -333,7 +864,7 @@ def main() -> None:
 
             raise InvalidCommand(command)
         except InvalidCommand as error:
-            LOG.info(f"Invalid command: {error}\nEnter `help` for instructions.")
+            LOG.info("Invalid command: %s\nEnter `help` for instructions.", error)
             continue
         except KeyboardInterrupt:
             LOG.info("\nExiting...")
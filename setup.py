@@ -0,0 +1,27 @@
+# This source code is licensed under the MIT license found in the
+# LICENSE file in the root directory of this source tree.
+
+# Build the optional compiled module next to the sources with
+#
+#   pip install mypy
+#   python setup.py build_ext --inplace
+#
+# The resulting `chess/chess.*.so` takes precedence over `chess/chess.py` on
+# import. Without mypy installed the module stays pure Python.
+
+from setuptools import setup
+
+try:
+    from mypyc.build import mypycify
+except ImportError:
+    ext_modules = []
+else:
+    ext_modules = mypycify(["chess/chess.py"])
+
+setup(
+    name="chess",
+    version="0.1",
+    package_dir={"": "chess"},
+    py_modules=["chess"],
+    ext_modules=ext_modules,
+)